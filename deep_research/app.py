@@ -7,15 +7,66 @@ from pydantic import BaseModel
 import asyncio
 import os
 import json # Import json to serialize messages
-from openai import OpenAI
+import re
 import tempfile
+from contextlib import asynccontextmanager
 
 from main import run_research # Your refactored research function
+from batch import load_queries, run_batch
+from llm import get_fanar_client, get_fanar_sync_client, get_tavily_client
+from tools import warm_up_parsers
+
+# Batch results are written here as <batch_id>.jsonl so a batch can be resumed
+BATCH_OUTPUT_DIR = os.getenv(
+    "BATCH_OUTPUT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "output_logs", "batches"),
+)
+
+WARM_UP_RETRY_DELAYS = (1, 2, 5, 10, 30)  # seconds between warm-up attempts; the last repeats
+warm_up_error: str | None = None  # last warm-up failure, reported by /readyz
+
+def clients_ready() -> bool:
+    """True once every shared client exists, whether built by warm-up or on first use."""
+    return all(
+        get_client.cache_info().currsize
+        for get_client in (get_fanar_client, get_fanar_sync_client, get_tavily_client)
+    )
+
+def build_clients():
+    """Build the shared API clients and import the page parsers."""
+    warm_up_parsers()
+    get_fanar_client()
+    get_fanar_sync_client()
+    get_tavily_client()
+
+async def warm_up():
+    """Retry build_clients with backoff until every client is ready."""
+    global warm_up_error
+    attempt = 0
+    while not clients_ready():
+        try:
+            await asyncio.to_thread(build_clients)
+            warm_up_error = None
+            print("Warm-up complete.")
+        except Exception as e:
+            warm_up_error = str(e)
+            delay = WARM_UP_RETRY_DELAYS[min(attempt, len(WARM_UP_RETRY_DELAYS) - 1)]
+            print(f"Warning: warm-up failed, retrying in {delay}s: {e}")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so the server starts accepting requests right away
+    warm_up_task = asyncio.create_task(warm_up())
+    yield
+    warm_up_task.cancel()
 
 app = FastAPI(
     title="AI Deep Research API",
     description="API for comprehensive AI-driven research based on user queries.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 origins = [
@@ -34,26 +85,29 @@ app.add_middleware(
 
 class QueryRequest(BaseModel):
     query: str
+    long_documents: bool = False  # Summarize long sources chunk by chunk
 
 class TTSRequest(BaseModel):
     text: str
 
-# Initialize OpenAI client for TTS and STT
-FANAR_API_KEY = os.getenv("FANAR_API_KEY")
-tts_client = OpenAI(
-    base_url="https://api.fanar.qa/v1",
-    api_key=FANAR_API_KEY
-)
-
-stt_client = OpenAI(
-    base_url="https://api.fanar.qa/v1",
-    api_key=FANAR_API_KEY
-)
-
 @app.get("/")
 async def root():
     return {"message": "Welcome to the AI Research Assistant API. Use /research for deep research."}
 
+@app.get("/healthz")
+async def healthz():
+    """Liveness probe: the process is up and serving."""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness probe: the shared API clients have been built."""
+    if clients_ready():
+        return {"status": "ready"}
+    if warm_up_error:
+        raise HTTPException(status_code=503, detail=f"warm-up failed: {warm_up_error}")
+    raise HTTPException(status_code=503, detail="Warming up")
+
 @app.post("/transcribe")
 async def transcribe_audio(file: UploadFile = File(...)):
     """
@@ -73,7 +127,7 @@ async def transcribe_audio(file: UploadFile = File(...)):
         try:
             # Transcribe using Fanar STT
             with open(temp_file_path, "rb") as f:
-                response = stt_client.audio.transcriptions.create(
+                response = get_fanar_sync_client().audio.transcriptions.create(
                     file=f,
                     model="Fanar-Aura-STT-1"
                 )
@@ -116,7 +170,7 @@ async def text_to_speech(request: TTSRequest):
         from concurrent.futures import ThreadPoolExecutor
         
         def create_tts():
-            return tts_client.audio.speech.create(
+            return get_fanar_sync_client().audio.speech.create(
                 model="Fanar-Aura-TTS-1",
                 input=text,
                 voice="default",
@@ -159,7 +213,7 @@ async def stream_research_paper(request: QueryRequest):
 
     async def event_generator():
         try:
-            async for message in run_research(request.query):
+            async for message in run_research(request.query, long_documents=request.long_documents):
                 # Send each message as a JSON string followed by a newline
                 # Frontend will parse this.
                 yield json.dumps(message) + "\n"
@@ -173,4 +227,36 @@ async def stream_research_paper(request: QueryRequest):
             print("Streaming complete or disconnected.")
 
     # Return StreamingResponse with media type text/plain for simpler line-delimited JSON
-    return StreamingResponse(event_generator(), media_type="text/plain")
\ No newline at end of file
+    return StreamingResponse(event_generator(), media_type="text/plain")
+
+@app.post("/research/batch")
+async def stream_research_batch(request: Request, batch_id: str | None = None, long_documents: bool = False):
+    """
+    API endpoint to run many research queries concurrently.
+
+    The request body is JSONL: one query string or {"id": ..., "query": ...} object
+    per line. Each result is streamed back as a JSON line as soon as it finishes.
+    With a batch_id, results are also saved on the server and re-posting the same
+    batch_id skips queries that already completed.
+    """
+    try:
+        items = load_queries((await request.body()).decode("utf-8").splitlines())
+    except ValueError as e:  # includes json.JSONDecodeError
+        raise HTTPException(status_code=400, detail=f"Invalid JSONL body: {e}")
+    if not items:
+        raise HTTPException(status_code=400, detail="No queries provided")
+
+    output_path = None
+    if batch_id is not None:
+        if not re.fullmatch(r"[A-Za-z0-9_-]{1,64}", batch_id):
+            raise HTTPException(status_code=400, detail="batch_id must be 1-64 letters, digits, '_' or '-'")
+        os.makedirs(BATCH_OUTPUT_DIR, exist_ok=True)
+        output_path = os.path.join(BATCH_OUTPUT_DIR, f"{batch_id}.jsonl")
+
+    print(f"Received batch of {len(items)} queries (batch_id={batch_id})")
+
+    async def event_generator():
+        async for record in run_batch(items, output_path, long_documents=long_documents):
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(event_generator(), media_type="text/plain")
@@ -0,0 +1,142 @@
+# deep_research/batch.py — run many research queries concurrently
+#
+#   python batch.py queries.jsonl results.jsonl [--concurrency 4] [--long-documents]
+#
+# Every input line is either a JSON string or an object with a "query" and an
+# optional "id" (defaults to the query). Results are appended to the output file
+# as they finish; re-running the same command skips queries already completed,
+# so a crashed batch can simply be resumed.
+
+import argparse
+import asyncio
+import json
+import os
+
+from main import run_research
+
+MAX_CONCURRENT_SESSIONS = 4  # research sessions in flight; LLM/search/scrape budgets are global
+
+
+def load_queries(lines) -> list[dict]:
+    """Parse JSONL query lines into [{"id": ..., "query": ...}, ...]."""
+    items = []
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        item = json.loads(line)
+        if isinstance(item, str):
+            item = {"query": item}
+        if not isinstance(item, dict) or not isinstance(item.get("query"), str) or not item["query"]:
+            raise ValueError(f"Line {line_no}: expected a string or an object with a 'query'")
+        item.setdefault("id", item["query"])
+        if not isinstance(item["id"], (str, int)) or isinstance(item["id"], bool):
+            raise ValueError(f"Line {line_no}: 'id' must be a string or an integer")
+        item["id"] = str(item["id"])  # ids are compared as strings when resuming
+        items.append(item)
+    return items
+
+
+def completed_ids(output_path: str | None) -> set:
+    """IDs that already have a successful result in the output file."""
+    done = set()
+    if not output_path or not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partial line left by a crash
+            if isinstance(record, dict) and "content" in record and record.get("id") is not None:
+                done.add(str(record["id"]))
+    return done
+
+
+async def _run_one(item: dict, long_documents: bool) -> dict:
+    record = {"id": item["id"], "query": item["query"]}
+    try:
+        final = None
+        async for message in run_research(item["query"], long_documents=long_documents):
+            if message["type"] == "final":
+                final = message
+        record["content"] = final["content"]
+        record["sources"] = final["sources"]
+    except Exception as e:
+        record["error"] = str(e)
+    return record
+
+
+async def run_batch(
+    items: list[dict],
+    output_path: str | None = None,
+    max_sessions: int = MAX_CONCURRENT_SESSIONS,
+    long_documents: bool = False,
+):
+    """Run research for every item, yielding result records as they complete.
+
+    At most ``max_sessions`` sessions run at once; within them every LLM, search
+    and scrape call shares the process‑wide budgets in ``llm`` and ``tools``, and
+    the scrape cache and summary index are shared too. With ``output_path``,
+    records are appended there immediately and items already completed in that
+    file are skipped.
+    """
+    done = completed_ids(output_path)
+    pending = [item for item in items if item["id"] not in done]
+    print(f"[DEBUG] Batch: {len(pending)} pending, {len(items) - len(pending)} already done")
+
+    session_sem = asyncio.Semaphore(max_sessions)
+
+    async def worker(item):
+        async with session_sem:
+            return await _run_one(item, long_documents)
+
+    tasks = [asyncio.create_task(worker(item)) for item in pending]
+    out = None
+    if output_path:
+        needs_newline = False
+        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            with open(output_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        out = open(output_path, "a", encoding="utf-8")
+        if needs_newline:
+            out.write("\n")  # never glue onto a partial line left by a crash
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            record = await next_done
+            if out:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+            yield record
+    finally:
+        for task in tasks:
+            task.cancel()
+        if out:
+            out.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run DeepFanar research over a JSONL file of queries.")
+    parser.add_argument("input", help="JSONL file of queries")
+    parser.add_argument("output", help="JSONL file results are appended to (resumable)")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_SESSIONS,
+                        help="research sessions to run at once")
+    parser.add_argument("--long-documents", action="store_true",
+                        help="summarize long sources chunk by chunk")
+    args = parser.parse_args()
+
+    with open(args.input, encoding="utf-8") as f:
+        items = load_queries(f)
+
+    async def drive():
+        async for record in run_batch(items, args.output, args.concurrency, args.long_documents):
+            status = "ok" if "content" in record else f"error: {record['error']}"
+            print(f"[BATCH] {record['id']}: {status}")
+
+    asyncio.run(drive())
+
+
+if __name__ == "__main__":
+    main()
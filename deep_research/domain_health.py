@@ -0,0 +1,114 @@
+# deep_research/domain_health.py — per‑host scrape health, negative caching and concurrency caps
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+DEFAULT_SCRAPE_TIMEOUT = 10.0   # seconds, for hosts with no history
+MIN_SCRAPE_TIMEOUT = 3.0        # never cut a fetch shorter than this
+SLOW_HOST_TIMEOUT = 4.0         # for hosts that keep timing out
+LATENCY_TIMEOUT_FACTOR = 3      # allow this many times a host's usual latency
+HEALTH_EWMA_ALPHA = 0.3         # weight of the newest fetch in the moving averages
+BAD_HOST_MIN_ATTEMPTS = 3       # fetches needed before a host can be marked bad
+BAD_HOST_FAILURE_RATE = 0.7     # failure rate above which a host is skipped
+BAD_HOST_TTL = 6 * 3600         # seconds a bad host is skipped before it gets another try
+MAX_FETCHES_PER_HOST = 2        # concurrent fetches allowed against one host
+SHORTENER_HOSTS = frozenset({"is.gd", "bit.ly", "tinyurl.com", "t.co", "goo.gl"})  # redirect to unrelated sites
+
+_hosts: dict[str, dict] = {}
+_host_slots: dict[str, list] = {}  # host -> [semaphore, waiting + active fetches]; event loop only
+_lock = threading.Lock()  # scrapes run in worker threads
+
+# --------------------------------------------------------------------------- #
+def host_of(url: str) -> str:
+    """Lower‑cased host of a URL without a leading 'www.'."""
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+def tracked_host(url: str) -> str:
+    """
+    Host whose health a URL counts towards, or "" for URL shorteners — those
+    stand for many unrelated sites, so only the host they resolve to is tracked.
+    """
+    host = host_of(url)
+    return "" if host in SHORTENER_HOSTS else host
+
+def record_result(url: str, ok: bool, latency: float, timed_out: bool = False) -> None:
+    """
+    Fold one fetch outcome into the host's moving failure rate, timeout rate
+    and (for successes) latency. Pass the final URL after redirects.
+    """
+    host = tracked_host(url)
+    if not host:
+        return
+    with _lock:
+        stats = _hosts.setdefault(
+            host,
+            {"attempts": 0, "failure_rate": 0.0, "timeout_rate": 0.0, "latency": None, "last_failure": 0.0},
+        )
+        a = HEALTH_EWMA_ALPHA if stats["attempts"] else 1.0
+        stats["attempts"] += 1
+        stats["failure_rate"] += a * ((not ok) - stats["failure_rate"])
+        stats["timeout_rate"] += a * (timed_out - stats["timeout_rate"])
+        if ok:
+            prev = stats["latency"]
+            stats["latency"] = latency if prev is None else prev + HEALTH_EWMA_ALPHA * (latency - prev)
+        else:
+            stats["last_failure"] = time.time()
+
+def is_bad_host(url: str) -> bool:
+    """
+    True if the host has failed most recent fetches and its last failure is
+    within BAD_HOST_TTL — such URLs are skipped instead of waiting on them.
+    """
+    with _lock:
+        stats = _hosts.get(tracked_host(url))
+        return bool(
+            stats
+            and stats["attempts"] >= BAD_HOST_MIN_ATTEMPTS
+            and stats["failure_rate"] >= BAD_HOST_FAILURE_RATE
+            and time.time() - stats["last_failure"] < BAD_HOST_TTL
+        )
+
+def bad_hosts() -> list[str]:
+    """Hosts currently considered bad, e.g. for a search API's exclude list."""
+    with _lock:
+        hosts = list(_hosts)
+    return [host for host in hosts if is_bad_host(f"https://{host}/")]
+
+def timeout_for(url: str) -> float:
+    """
+    Request timeout for a URL: the default for unknown hosts, a short one for hosts
+    that keep timing out, otherwise a multiple of the host's usual latency.
+    """
+    with _lock:
+        stats = _hosts.get(tracked_host(url))
+        if not stats:
+            return DEFAULT_SCRAPE_TIMEOUT
+        if stats["timeout_rate"] >= 0.5:
+            return SLOW_HOST_TIMEOUT
+        if stats["latency"] is None:
+            return DEFAULT_SCRAPE_TIMEOUT
+        return max(MIN_SCRAPE_TIMEOUT, min(DEFAULT_SCRAPE_TIMEOUT, LATENCY_TIMEOUT_FACTOR * stats["latency"]))
+
+@asynccontextmanager
+async def host_slot(url: str):
+    """
+    Hold one of the MAX_FETCHES_PER_HOST fetch slots for the URL's host. Entries
+    are dropped as soon as no fetch is waiting on or using them.
+    """
+    host = tracked_host(url)
+    if not host:
+        yield
+        return
+    slot = _host_slots.setdefault(host, [asyncio.Semaphore(MAX_FETCHES_PER_HOST), 0])
+    slot[1] += 1
+    try:
+        async with slot[0]:
+            yield
+    finally:
+        slot[1] -= 1
+        if not slot[1]:
+            del _host_slots[host]
@@ -1,21 +1,33 @@
 import asyncio, os
+from functools import lru_cache
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
-from tavily import TavilyClient
 
 load_dotenv()
 FANAR_API_KEY = os.getenv("FANAR_API_KEY")
+FANAR_BASE_URL = "https://api.fanar.qa/v1"
 
 TAVILY_API_KEY = os.environ.get("TAVILY_API_KEY")
-tavily_client = TavilyClient(TAVILY_API_KEY)
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GOOGLE_CX_ID = os.getenv("GOOGLE_SEARCH_ENGINE_ID")
 
-fanar_client = AsyncOpenAI(
-    base_url="https://api.fanar.qa/v1",
-    api_key=FANAR_API_KEY,
-)
+# Clients (and the SDKs behind them) are built on first use, so importing this
+# module stays cheap and every caller shares one instance of each.
+@lru_cache(maxsize=None)
+def get_fanar_client():
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(base_url=FANAR_BASE_URL, api_key=FANAR_API_KEY)
+
+@lru_cache(maxsize=None)
+def get_fanar_sync_client():
+    """Blocking Fanar client, used for TTS and STT."""
+    from openai import OpenAI
+    return OpenAI(base_url=FANAR_BASE_URL, api_key=FANAR_API_KEY)
+
+@lru_cache(maxsize=None)
+def get_tavily_client():
+    from tavily import TavilyClient
+    return TavilyClient(TAVILY_API_KEY)
 
 MODEL = "Fanar"
 MAX_CONCURRENT = 10              # keep ≤ your “concurrent requests” quota
@@ -23,7 +35,7 @@ sem = asyncio.Semaphore(MAX_CONCURRENT)
 
 async def ask(system_prompt: str, user_prompt: str) -> str:
     async with sem:              # blocks when too many in‑flight calls
-        resp = await fanar_client.chat.completions.create(
+        resp = await get_fanar_client().chat.completions.create(
             model=MODEL,
             messages=[{"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}],
@@ -1,4 +1,4 @@
-# deep_research/main.py — minimal debug prints only
+# deep_research/main.py — research orchestration: planning, search loops, synthesis
 
 import asyncio
 import re
@@ -6,7 +6,10 @@ from datetime import date  # kept for possible future use
 import json  # kept for possible future use
 
 from llm import ask
-from tools import url_scrape, tavily_search, google_search, is_usable_content, prepare_content_for_llm
+from summary_index import add_summaries, get_summary, search_summaries
+from tools import scrape_async, search_async, tavily_search, google_search, is_usable_content, prepare_content_for_llm
+from tools import content_terms, novelty_score, NOVELTY_THRESHOLD, estimate_tokens
+from tools import chunk_text, is_failed_scrape, is_web_url, MAX_SCRAPE_LENGTH, LONG_DOC_MAX_SCRAPE_LENGTH
 from prompts import (
     planner_system_prompt,
     english_queries_system_prompt,
@@ -14,14 +17,92 @@ from prompts import (
     summarize_english_system_prompt,
     summarize_arabic_system_prompt,
     synthesizer_system_prompt,
+    partial_synthesizer_system_prompt,
 )
 
+SYNTHESIS_MAX_SOURCES = 8       # above this, synthesize hierarchically (map‑reduce)
+SYNTHESIS_MAX_TOKENS = 12000    # ...or above this estimated prompt size
+SYNTHESIS_GROUP_SIZE = 4        # sources merged per partial synthesis call
 
-async def run_research(original_query: str):
+
+def strip_think(text: str) -> str:
+    """Remove <think>…</think> reasoning blocks from a model response."""
+    return re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL).strip()
+
+
+async def summarize_source(system_prompt: str, text: str, user_prompt: str) -> str:
+    """Summarize one scraped source.
+
+    Text that fits one LLM call is summarized directly. Longer text (long‑document
+    mode) is split into token‑budgeted chunks that are summarized in parallel —
+    ``ask`` keeps this under the concurrency limit — and the chunk summaries are
+    merged by one more summarization pass.
+    """
+    chunks = chunk_text(text)
+    if len(chunks) == 1:
+        return await ask(system_prompt + f"text: {text}\n", user_prompt)
+
+    partials = await asyncio.gather(
+        *(ask(system_prompt + f"text: {chunk}\n", user_prompt) for chunk in chunks)
+    )
+    merged = "\n\n".join(strip_think(p) for p in partials)
+    return await ask(system_prompt + f"text: {merged}\n", user_prompt)
+
+
+async def synthesize(original_query: str, all_sources: list[str]) -> str:
+    """Write the final paper from the source blocks.
+
+    Small source sets go straight to the synthesizer. Large ones are grouped,
+    merged into cited notes in parallel, and reduced level by level until they
+    fit a single final pass, so latency grows with log(#sources).
+    """
+    blocks = all_sources
+    while (
+        len(blocks) > SYNTHESIS_MAX_SOURCES
+        or estimate_tokens("\n\n".join(blocks)) > SYNTHESIS_MAX_TOKENS
+    ) and len(blocks) > 1:
+        groups = [
+            blocks[g:g + SYNTHESIS_GROUP_SIZE]
+            for g in range(0, len(blocks), SYNTHESIS_GROUP_SIZE)
+        ]
+        print(f"[DEBUG] Map‑reduce synthesis: {len(blocks)} blocks -> {len(groups)} groups")
+        partials = await asyncio.gather(
+            *(
+                ask(partial_synthesizer_system_prompt() + "Sources:\n" + "\n\n".join(group), original_query)
+                for group in groups
+                if len(group) > 1
+            )
+        )
+        # A leftover single block has nothing to merge, so it passes through as is
+        partials = iter(partials)
+        blocks = [
+            f"Notes:\n{strip_think(next(partials))}" if len(group) > 1 else group[0]
+            for group in groups
+        ]
+
+    synthesis = await ask(
+        synthesizer_system_prompt() + "Sources:\n" + "\n\n".join(blocks), original_query
+    )
+    return strip_think(synthesis)
+
+
+async def run_research(
+    original_query: str, long_documents: bool = False, use_index: bool = True
+):
     """Orchestrate multilingual web‑research with progress events.
 
-    Only *additional* behaviour beyond the original version is a handful of
-    print statements for lightweight debugging. No other logic changed.
+    Each loop searches, scrapes and summarizes one English and one Arabic
+    query, and research stops early once a loop adds little novel content.
+    The summaries are then synthesized into a paper, hierarchically when
+    there are many of them.
+
+    With ``long_documents`` set, sources are scraped up to
+    ``LONG_DOC_MAX_SCRAPE_LENGTH`` and summarized chunk by chunk instead of
+    being truncated to a single LLM call.
+
+    With ``use_index`` set, fresh summaries from past runs that match a loop's
+    queries are reused as sources, and the web is searched only for the
+    remaining slots. New summaries are added to the index.
     """
 
     # ------------------------------------------------------------
@@ -35,6 +116,8 @@ async def run_research(original_query: str):
 
     number_of_loops: int = 0
 
+    scrape_length = LONG_DOC_MAX_SCRAPE_LENGTH if long_documents else MAX_SCRAPE_LENGTH
+
     # Language‑specific buffers
     english_queries: list[str] = []
     arabic_queries: list[str] = []
@@ -48,10 +131,13 @@ async def run_research(original_query: str):
     english_summaries: list[str] = []
     arabic_summaries: list[str] = []
 
+    # Content terms of every summary gathered so far, for novelty‑based early stopping
+    seen_terms: set[str] = set()
+
     # ------------------------------------------------------------
     # 1) DETERMINE LOOP COUNT
     # ------------------------------------------------------------
-    number_of_loops_str = await ask(planner_system_prompt, original_query)
+    number_of_loops_str = await ask(planner_system_prompt(), original_query)
     try:
         number_of_loops = int(number_of_loops_str)
     except ValueError:
@@ -88,10 +174,10 @@ async def run_research(original_query: str):
 
         # Compose system prompts
         queries_system_prompts = [
-            english_queries_system_prompt
+            english_queries_system_prompt()
             + f"Already searched queries: {english_queries}\n"
             + f"Current summaries: {english_summaries}",
-            arabic_queries_system_prompt
+            arabic_queries_system_prompt()
             + f"Already searched queries: {arabic_queries}\n"
             + f"Current summaries: {arabic_summaries}",
         ]
@@ -125,27 +211,79 @@ async def run_research(original_query: str):
         english_queries.append(queries[0])
         arabic_queries.append(queries[1])
 
-        new_en_urls = tavily_search(english_queries[-1])[:2]
-        new_ar_urls = google_search(arabic_queries[-1])[:2]
+        # Reuse fresh summaries from past research before going to the web
+        cached_en = cached_ar = []
+        if use_index:
+            cached_en, cached_ar = await asyncio.gather(
+                asyncio.to_thread(search_summaries, english_queries[-1], "en", exclude_urls=english_urls),
+                asyncio.to_thread(search_summaries, arabic_queries[-1], "ar", exclude_urls=arabic_urls),
+            )
+        for url, summary in cached_en:
+            english_urls.append(url)
+            english_summaries.append(summary)
+        for url, summary in cached_ar:
+            arabic_urls.append(url)
+            arabic_summaries.append(summary)
+        cached_summaries = [summary for _, summary in cached_en + cached_ar]
+
+        # Both searches run concurrently under the process‑wide search budget
+        new_en_urls, new_ar_urls = await asyncio.gather(
+            search_async(tavily_search, english_queries[-1]) if len(cached_en) < 2 else asyncio.sleep(0, []),
+            search_async(google_search, arabic_queries[-1]) if len(cached_ar) < 2 else asyncio.sleep(0, []),
+        )
+        # Drop search error messages returned in place of URLs
+        new_en_urls = [url for url in new_en_urls if is_web_url(url)][:2 - len(cached_en)]
+        new_ar_urls = [url for url in new_ar_urls if is_web_url(url)][:2 - len(cached_ar)]
+
+        # Searched pages summarized by an earlier run (or another batch session)
+        # are reused instead of being scraped and summarized again. Pages already
+        # collected in this run are dropped rather than added as duplicate sources.
+        if use_index:
+            for language, new_urls, urls, lang_summaries in (
+                ("en", new_en_urls, english_urls, english_summaries),
+                ("ar", new_ar_urls, arabic_urls, arabic_summaries),
+            ):
+                for url in [u for u in new_urls if u in urls]:
+                    new_urls.remove(url)
+                known = await asyncio.gather(
+                    *(asyncio.to_thread(get_summary, url, language) for url in new_urls)
+                )
+                for url, summary in zip(list(new_urls), known):
+                    if summary:
+                        new_urls.remove(url)
+                        urls.append(url)
+                        lang_summaries.append(summary)
+                        cached_summaries.append(summary)
+
+        if cached_summaries:
+            print(f"[DEBUG] Loop {loop_idx}: reused {len(cached_summaries)} indexed summaries")
+            yield {
+                "type": "progress",
+                "stage": "Reusing sources from past research...",
+                "detail": f"Found {len(cached_summaries)} indexed sources.",
+            }
+
+        en_scrapes, ar_scrapes = await asyncio.gather(
+            asyncio.gather(*(scrape_async(url, scrape_length) for url in new_en_urls)),
+            asyncio.gather(*(scrape_async(url, scrape_length) for url in new_ar_urls)),
+        )
 
         good_en_urls, good_en_scrapes = [], []
         bad_en_urls, bad_en_scrapes = [], []
-        for url in new_en_urls:
-            scrape = url_scrape(url)
-            if scrape and is_usable_content(scrape):
+        for url, scrape in zip(new_en_urls, en_scrapes):
+            if scrape and not is_failed_scrape(scrape) and is_usable_content(scrape):
                 good_en_urls.append(url)
-                good_en_scrapes.append(prepare_content_for_llm(scrape))
+                good_en_scrapes.append(scrape if long_documents else prepare_content_for_llm(scrape))
             else:
                 bad_en_urls.append(url)
                 bad_en_scrapes.append(scrape)
 
         good_ar_urls, good_ar_scrapes = [], []
         bad_ar_urls, bad_ar_scrapes = [], []
-        for url in new_ar_urls:
-            scrape = url_scrape(url)
-            if scrape and is_usable_content(scrape):
+        for url, scrape in zip(new_ar_urls, ar_scrapes):
+            if scrape and not is_failed_scrape(scrape) and is_usable_content(scrape):
                 good_ar_urls.append(url)
-                good_ar_scrapes.append(prepare_content_for_llm(scrape))
+                good_ar_scrapes.append(scrape if long_documents else prepare_content_for_llm(scrape))
             else:
                 bad_ar_urls.append(url)
                 bad_ar_scrapes.append(scrape)
@@ -176,21 +314,21 @@ async def run_research(original_query: str):
             "detail": f"Found {len(good_en_scrapes) + len(good_ar_scrapes)} new sources.",
         }
 
-        summarize_system_prompts = (
-            [summarize_english_system_prompt + f"text: {s}\n" for s in good_en_scrapes]
-            + [summarize_arabic_system_prompt + f"text: {s}\n" for s in good_ar_scrapes]
+        summarize_jobs = (
+            [(summarize_english_system_prompt(), s) for s in good_en_scrapes]
+            + [(summarize_arabic_system_prompt(), s) for s in good_ar_scrapes]
         )
 
-        if not summarize_system_prompts:
+        if not summarize_jobs and not cached_summaries:
             yield {
                 "type": "progress",
                 "stage": "No new content to summarize for this loop.",
                 "detail": "",
             }
-            continue
+            continue  # nothing to judge novelty on; try the next follow-up query
 
         summaries = await asyncio.gather(
-            *(ask(s_prompt, temp_summary_query) for s_prompt in summarize_system_prompts)
+            *(summarize_source(s_prompt, text, temp_summary_query) for s_prompt, text in summarize_jobs)
         )
         temp_summary_query = "Write a summary."  # placeholder
 
@@ -198,6 +336,31 @@ async def run_research(original_query: str):
         english_summaries.extend(summaries[:en_count])
         arabic_summaries.extend(summaries[en_count:])
 
+        if use_index:
+            await asyncio.to_thread(
+                add_summaries,
+                [(url, "en", summary) for url, summary in zip(good_en_urls, summaries[:en_count])]
+                + [(url, "ar", summary) for url, summary in zip(good_ar_urls, summaries[en_count:])],
+            )
+
+        # --------------------------------------------------------
+        # 2c) NOVELTY CHECK — stop once loops only repeat known facts
+        # --------------------------------------------------------
+        loop_terms = content_terms("\n".join(cached_summaries + list(summaries)))
+        novelty = novelty_score(loop_terms, seen_terms)
+        had_prior_content = bool(seen_terms)  # the first content has nothing to repeat
+        seen_terms |= loop_terms.keys()
+
+        print(f"[DEBUG] Loop {loop_idx}: novelty = {novelty:.2f}")
+
+        if had_prior_content and loop_terms and loop_idx < number_of_loops and novelty < NOVELTY_THRESHOLD:
+            yield {
+                "type": "progress",
+                "stage": "Stopping early: new sources add little new information.",
+                "detail": f"{loop_idx}/{number_of_loops}",
+            }
+            break
+
     # ------------------------------------------------------------
     # 3) FINAL SYNTHESIS
     # ------------------------------------------------------------
@@ -217,11 +380,7 @@ async def run_research(original_query: str):
             "Please try a different query."
         )
     else:
-        synthesis_prompt_input = (
-            synthesizer_system_prompt + "Sources:\n" + "\n\n".join(all_sources)
-        )
-        synthesis = await ask(synthesis_prompt_input, original_query)
-        synthesis_clean = re.sub(r"<think>.*?</think>", "", synthesis, flags=re.DOTALL).strip()
+        synthesis_clean = await synthesize(original_query, all_sources)
 
     print(f"[DEBUG] Final synthesis length: {len(synthesis_clean)} characters")
     
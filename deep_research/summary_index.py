@@ -0,0 +1,125 @@
+# deep_research/summary_index.py — local full‑text index of past source summaries
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from tools import NOVELTY_FACT_WEIGHT, content_terms
+
+INDEX_PATH = os.getenv(
+    "SUMMARY_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "summary_index.db"),
+)
+INDEX_MAX_AGE_HOURS = 24          # summaries older than this are stale; topics change fast
+INDEX_MIN_TERM_COVERAGE = 0.6     # fraction of the query's content terms a summary must contain
+
+# These functions block on disk I/O; async callers run them via asyncio.to_thread.
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+# --------------------------------------------------------------------------- #
+def _connect() -> sqlite3.Connection:
+    global _schema_ready
+    conn = sqlite3.connect(INDEX_PATH)
+    if not _schema_ready:
+        with _schema_lock:
+            if not _schema_ready:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS summaries USING fts5("
+                    "url UNINDEXED, language UNINDEXED, summary, created_at UNINDEXED)"
+                )
+                _schema_ready = True
+    return conn
+
+def _min_created_at() -> float:
+    return time.time() - INDEX_MAX_AGE_HOURS * 3600
+
+def _is_relevant(query_terms: dict[str, float], summary: str) -> bool:
+    """
+    A summary is relevant if it contains every number and proper noun of the
+    query and at least INDEX_MIN_TERM_COVERAGE of its content terms.
+    """
+    summary_terms = content_terms(summary)
+    if any(w >= NOVELTY_FACT_WEIGHT and t not in summary_terms for t, w in query_terms.items()):
+        return False
+    coverage = sum(t in summary_terms for t in query_terms) / len(query_terms)
+    return coverage >= INDEX_MIN_TERM_COVERAGE
+
+# --------------------------------------------------------------------------- #
+def add_summaries(rows: list[tuple[str, str, str]]) -> None:
+    """
+    Store (or refresh) (url, language, summary) rows so later research runs can
+    reuse them, and drop rows older than INDEX_MAX_AGE_HOURS.
+    """
+    if not rows:
+        return
+    now = time.time()
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute("DELETE FROM summaries WHERE created_at < ?", (_min_created_at(),))
+            for url, language, summary in rows:
+                conn.execute(
+                    "DELETE FROM summaries WHERE url = ? AND language = ?", (url, language)
+                )
+                conn.execute(
+                    "INSERT INTO summaries (url, language, summary, created_at) VALUES (?, ?, ?, ?)",
+                    (url, language, summary, now),
+                )
+    except sqlite3.Error as e:
+        print(f"Warning: could not index {len(rows)} summaries: {e}")
+
+def get_summary(url: str, language: str) -> str | None:
+    """
+    Return the fresh indexed summary of a URL, or None if it is missing or stale.
+    """
+    try:
+        with closing(_connect()) as conn:
+            row = conn.execute(
+                "SELECT summary FROM summaries WHERE url = ? AND language = ? AND created_at >= ?",
+                (url, language, _min_created_at()),
+            ).fetchone()
+    except sqlite3.Error as e:
+        print(f"Warning: summary index lookup failed: {e}")
+        return None
+    return row[0] if row else None
+
+def search_summaries(
+    query: str,
+    language: str,
+    limit: int = 2,
+    exclude_urls: list[str] | None = None,
+) -> list[tuple[str, str]]:
+    """
+    Return up to `limit` fresh (url, summary) pairs relevant to the query, best
+    BM25 match first. Stopwords are ignored; see _is_relevant for the match rule.
+    """
+    terms = content_terms(query)
+    if not terms:
+        return []
+
+    exclude = set(exclude_urls or [])
+    # Prefix queries, since content_terms folds plurals ("sale" must match "sales")
+    match = " OR ".join('"' + t.replace('"', '""') + '"*' for t in terms)
+    try:
+        with closing(_connect()) as conn:
+            rows = conn.execute(
+                "SELECT url, summary FROM summaries "
+                "WHERE summaries MATCH ? AND language = ? AND created_at >= ? "
+                "ORDER BY bm25(summaries) LIMIT ?",
+                (match, language, _min_created_at(), limit + len(exclude) + 10),
+            ).fetchall()
+    except sqlite3.Error as e:
+        print(f"Warning: summary index lookup failed: {e}")
+        return []
+
+    results = []
+    for url, summary in rows:
+        if url in exclude:
+            continue
+        if _is_relevant(terms, summary):
+            results.append((url, summary))
+            if len(results) >= limit:
+                break
+    return results
@@ -1,18 +1,43 @@
+import asyncio
+import threading
+import time
 import requests
-from bs4 import BeautifulSoup
 import json
-from pdfminer.high_level import extract_text
 import io
 import re
 
-from llm import tavily_client
+from llm import get_tavily_client
 
 from llm import GOOGLE_API_KEY, GOOGLE_CX_ID
 
+from domain_health import bad_hosts, host_of, host_slot, is_bad_host, record_result, timeout_for
+
 URL_CHAR_LIMIT = 125 # adjust
 MAX_SCRAPE_LENGTH = 5000  # Maximum characters for scraped content
+LONG_DOC_MAX_SCRAPE_LENGTH = 48000  # Scrape limit in long-document mode (~4 chunks)
 MAX_LLM_CONTENT_LENGTH = 3000  # Maximum characters to send to LLM
 MAX_TOKENS_PER_CONTENT = 3000  # Conservative token limit per content piece
+NOVELTY_FACT_WEIGHT = 3.0  # Weight of numbers and capitalized names vs. other content words
+NOVELTY_THRESHOLD = 0.5  # Stop looping once less than half of a loop's weighted terms are new
+NOVELTY_STOPWORDS = frozenset("""
+a an the and or but if of to in on at by for with from as is are was were be been being has have had
+do does did this that these those it its they them their there here which who whom whose what when where
+why how than then so such not no nor only also very more most much many some any each other into over
+under about after before during between while up down out off again further once can could will would
+should may might must shall our we you your he she his her all both few own same too just per via within
+across among around against according report reported reports new year years total overall including
+include includes based like well
+في من على إلى الى عن أن إن ان هذا هذه ذلك التي الذي الذين كان كانت مع كما أو او ثم قد لا ما هو هي وفي وقد
+""".split())
+MAX_CONCURRENT_SEARCHES = 4  # Process-wide cap on in-flight search API calls
+MAX_CONCURRENT_SCRAPES = 8  # Process-wide cap on in-flight page fetches
+SCRAPE_CACHE_TTL = 3600  # Seconds a scraped page is reused across research sessions
+SCRAPE_CACHE_MAX_ENTRIES = 2048  # Oldest pages are evicted past this size
+
+search_sem = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+scrape_sem = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+_scrape_cache: dict[tuple[str, int], tuple[float, str]] = {}
+_scrape_cache_lock = threading.Lock()  # url_scrape runs in worker threads
 
 # --------------------------------------------------------------------------- #
 def estimate_tokens(text: str) -> int:
@@ -33,6 +58,31 @@ def truncate_for_llm(text: str) -> str:
     max_chars = MAX_TOKENS_PER_CONTENT * 4  # Convert back to character limit
     return text[:max_chars] + "..."
 
+def chunk_text(text: str, max_tokens: int = MAX_TOKENS_PER_CONTENT) -> list[str]:
+    """
+    Split text into chunks of at most max_tokens (per estimate_tokens), cutting at
+    paragraph, line, sentence or word boundaries where possible.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    max_chars = max_tokens * 4
+    chunks = []
+    while estimate_tokens(text) > max_tokens:
+        window = text[:max_chars]
+        cut = max_chars
+        for sep in ("\n\n", "\n", ". ", " "):
+            idx = window.rfind(sep)
+            if idx >= max_chars // 2:  # don't produce tiny chunks
+                cut = idx + len(sep)
+                break
+        chunks.append(text[:cut].strip())
+        text = text[cut:]
+
+    if text.strip():
+        chunks.append(text.strip())
+    return chunks
+
 def is_corrupted_content(text: str) -> bool:
     """
     Check if scraped content is corrupted or has encoding issues.
@@ -64,6 +114,20 @@ def is_content_too_long(text: str) -> bool:
     """
     return estimate_tokens(text) > MAX_TOKENS_PER_CONTENT
 
+def is_web_url(text: str) -> bool:
+    """
+    True for http(s) URLs. Search helpers return error messages such as
+    "Tavily search failed: ..." in place of URLs, and those must not be scraped.
+    """
+    return text.startswith(("http://", "https://"))
+
+def is_failed_scrape(text: str) -> bool:
+    """
+    True for the error messages url_scrape returns instead of page text. They
+    read like prose, so is_usable_content alone does not reject them.
+    """
+    return text.startswith("Failed to scrape")
+
 def is_usable_content(text: str) -> bool:
     """
     Comprehensive check for whether content is usable for LLM processing.
@@ -92,7 +156,92 @@ def prepare_content_for_llm(text: str) -> str:
     return truncate_for_llm(text)
 
 # --------------------------------------------------------------------------- #
-def url_scrape(url: str) -> str:
+def content_terms(text: str) -> dict[str, float]:
+    """
+    Weighted content words of a text: lower-cased, stopwords dropped, plural -s
+    stripped. Numbers and capitalized names carry the facts, so they weigh
+    NOVELTY_FACT_WEIGHT; other words weigh 1. Comparing terms rather than phrases
+    lets paraphrases of the same facts overlap.
+    """
+    terms: dict[str, float] = {}
+    for raw in re.findall(r"\w+", text):
+        word = raw.lower()
+        if word in NOVELTY_STOPWORDS or (len(word) < 3 and not word.isdigit()):
+            continue
+        if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        weight = NOVELTY_FACT_WEIGHT if raw[0].isdigit() or raw[0].isupper() else 1.0
+        terms[word] = max(terms.get(word, 0.0), weight)
+    return terms
+
+def novelty_score(new_terms: dict[str, float], seen_terms: set[str]) -> float:
+    """
+    Weighted fraction of new_terms not seen before (1.0 = all new, 0.0 = nothing new).
+    Cheap local check used to stop research loops that only repeat known facts.
+    Paraphrased summaries of known facts score around 0.4, new facts 0.8 and up.
+    """
+    total = sum(new_terms.values())
+    if not total:
+        return 0.0
+    return sum(w for term, w in new_terms.items() if term not in seen_terms) / total
+
+# --------------------------------------------------------------------------- #
+def warm_up_parsers() -> None:
+    """
+    Import the HTML and PDF parsers ahead of the first scrape. They are otherwise
+    imported lazily to keep startup fast.
+    """
+    import bs4  # noqa: F401
+    import pdfminer.high_level  # noqa: F401
+
+# --------------------------------------------------------------------------- #
+async def search_async(search_fn, query: str) -> list[str]:
+    """
+    Run a blocking search function in a worker thread under the global search budget,
+    so concurrent research sessions don't stall the event loop.
+    """
+    async with search_sem:
+        return await asyncio.to_thread(search_fn, query)
+
+async def scrape_async(url: str, max_length: int = MAX_SCRAPE_LENGTH) -> str:
+    """
+    url_scrape in a worker thread under the per-host cap and the global scrape budget.
+    The host slot is taken first, so fetches queued on a busy host don't hold
+    global slots that other hosts could use.
+    """
+    async with host_slot(url):
+        async with scrape_sem:
+            return await asyncio.to_thread(url_scrape, url, max_length)
+
+# --------------------------------------------------------------------------- #
+def url_scrape(url: str, max_length: int = MAX_SCRAPE_LENGTH) -> str:
+    """
+    Scrape a URL, reusing the page if it was fetched successfully within
+    SCRAPE_CACHE_TTL seconds (shared by every session in this process).
+    Hosts that keep failing are skipped without a request and yield "", so they
+    cost no summarization call either.
+    """
+    if is_bad_host(url):
+        print(f"[DEBUG] Skipping {url}: host {host_of(url)} failed repeatedly")
+        return ""
+
+    key = (url, max_length)
+    with _scrape_cache_lock:
+        hit = _scrape_cache.get(key)
+    if hit and time.time() - hit[0] < SCRAPE_CACHE_TTL:
+        return hit[1]
+
+    text = _url_scrape(url, max_length)
+    if is_failed_scrape(text) or not is_usable_content(text):
+        return text  # failures are retried; dead hosts are handled by domain_health
+    with _scrape_cache_lock:
+        _scrape_cache.pop(key, None)  # re-insert so dict order stays oldest-first
+        _scrape_cache[key] = (time.time(), text)
+        while len(_scrape_cache) > SCRAPE_CACHE_MAX_ENTRIES:
+            _scrape_cache.pop(next(iter(_scrape_cache)))
+    return text
+
+def _url_scrape(url: str, max_length: int) -> str:
     headers = {
         "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -101,8 +250,14 @@ def url_scrape(url: str) -> str:
         )
     }
 
+    start = time.monotonic()
     try:
-        r = requests.get(url, headers=headers, timeout=10)
+        r = requests.get(url, headers=headers, timeout=timeout_for(url))
+        latency = time.monotonic() - start
+        final_url = r.url  # health is tracked for the host redirects end up on
+        if final_url != url and is_bad_host(final_url):
+            print(f"[DEBUG] Skipping {url}: host {host_of(final_url)} failed repeatedly")
+            return ""
         r.raise_for_status()
 
         # ------------ PDF or HTML? ---------------------------------
@@ -113,9 +268,11 @@ def url_scrape(url: str) -> str:
 
         if is_pdf:
             # ----------- PDF branch --------------------------------
+            from pdfminer.high_level import extract_text
             text = extract_text(io.BytesIO(r.content)) or ""
         else:
             # ----------- HTML branch -------------------------------
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(r.text, "html.parser")
             for tag in soup(["script", "style"]):
                 tag.decompose()
@@ -124,25 +281,31 @@ def url_scrape(url: str) -> str:
         text = text.strip()
         
         # Apply length limit
-        if len(text) > MAX_SCRAPE_LENGTH:
-            text = text[:MAX_SCRAPE_LENGTH]
+        if len(text) > max_length:
+            text = text[:max_length]
         
         # Validate content quality
         if not is_usable_content(text):
+            record_result(final_url, ok=False, latency=latency)
             return f"Failed to scrape usable content from {url}: Content is corrupted, too long, or lacks meaningful text"
         
+        record_result(final_url, ok=True, latency=latency)
         return text
 
     except Exception as e:
+        timed_out = isinstance(e, requests.exceptions.Timeout)
+        # For redirected requests the failing request carries the target URL
+        failed_url = getattr(getattr(e, "request", None), "url", None) or url
+        record_result(failed_url, ok=False, latency=time.monotonic() - start, timed_out=timed_out)
         return f"Failed to scrape content from {url}: {e}"
     
 # --------------------------------------------------------------------------- #
 def tavily_search(query: str) -> list[str]:
     try:
-        response = tavily_client.search(
+        response = get_tavily_client().search(
             query=query, 
             max_results=2, 
-            exclude_domains=["sciencedirect.com"]
+            exclude_domains=["sciencedirect.com", *bad_hosts()]
             )
         urls = []
         for item in response["results"]:
@@ -161,7 +324,7 @@ def google_search(query: str) -> list[str]:
         "key": GOOGLE_API_KEY,
         "cx":  GOOGLE_CX_ID,
         "q":   query,
-        "num": 2
+        "num": 4  # a little headroom for results on hosts we skip
     }
 
     try:
@@ -172,9 +335,13 @@ def google_search(query: str) -> list[str]:
         urls = []
         for item in data.get("items", []):
             link = item["link"]
+            if is_bad_host(link):
+                continue
             if len(link) > URL_CHAR_LIMIT:
                 link = shorten_url(link)
             urls.append(link)
+            if len(urls) == 2:
+                break
         return urls or ["No results returned by Google."]
     except Exception as e:
         return [f"Google search failed: {e}"]
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The backend modules import each other by bare name (`from llm import ask`),
+# as they do when run from inside deep_research/.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deep_research"))
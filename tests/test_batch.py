@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+import pytest
+
+import batch
+
+
+def test_load_queries_accepts_strings_and_objects():
+    items = batch.load_queries(['"plain query"', '{"id": 7, "query": "x"}', "", '{"id": "a", "query": "y"}'])
+    assert items == [
+        {"id": "plain query", "query": "plain query"},
+        {"id": "7", "query": "x"},
+        {"id": "a", "query": "y"},
+    ]
+
+
+@pytest.mark.parametrize("line", ['{"id": [1], "query": "x"}', '{"id": true, "query": "x"}', '{"query": 5}', "[1]", "{}"])
+def test_load_queries_rejects_bad_lines(line):
+    with pytest.raises(ValueError):
+        batch.load_queries([line])
+
+
+def test_completed_ids_skips_malformed_lines(tmp_path):
+    out = tmp_path / "out.jsonl"
+    out.write_text('{"content": "no id"}\n[1]\n{"id": 7, "content": "c"}\n{"id": "b", "error": "e"}\n{"id": "c", "con')
+    assert batch.completed_ids(str(out)) == {"7"}
+
+
+def test_run_batch_resumes_after_partial_output(tmp_path, monkeypatch):
+    async def fake_research(query, long_documents=False):
+        yield {"type": "progress"}
+        yield {"type": "final", "content": f"paper on {query}", "sources": []}
+
+    monkeypatch.setattr(batch, "run_research", fake_research)
+    out = tmp_path / "out.jsonl"
+    out.write_text('{"id": "1", "query": "a", "content": "done", "sources": []}\n{"id": "2", "qu')
+    items = batch.load_queries(['{"id": 1, "query": "a"}', '{"id": 2, "query": "b"}'])
+
+    async def collect():
+        return [record async for record in batch.run_batch(items, str(out))]
+
+    assert [record["id"] for record in asyncio.run(collect())] == ["2"]
+    lines = out.read_text().splitlines()
+    assert json.loads(lines[-1])["content"] == "paper on b"
@@ -0,0 +1,44 @@
+import sqlite3
+import time
+
+import pytest
+
+import summary_index
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(summary_index, "INDEX_PATH", str(tmp_path / "index.db"))
+    monkeypatch.setattr(summary_index, "_schema_ready", False)
+    summary_index.add_summaries([
+        ("http://london", "en", "The weather in London today is rainy with highs of 14C."),
+        ("http://doha", "en", "Doha weather today: sunny, 41C, humid winds from the Gulf."),
+        ("http://tesla", "en", "Tesla Model 3 battery packs have an energy density of 160 Wh/kg in 2024."),
+    ])
+    return summary_index
+
+
+def test_stopwords_alone_do_not_match(index):
+    results = index.search_summaries("What is the weather like today in Doha", "en")
+    assert [url for url, _ in results] == ["http://doha"]
+
+
+def test_query_names_and_numbers_must_all_appear(index):
+    assert index.search_summaries("What is the weather like today in Paris", "en") == []
+    assert index.search_summaries("energy density of Tesla Model 3 batteries 2023", "en") == []
+    assert index.search_summaries("energy density of Tesla Model 3 batteries 2024", "en")
+
+
+def test_language_and_exclusions(index):
+    assert index.search_summaries("Doha weather today", "ar") == []
+    assert index.search_summaries("Doha weather today", "en", exclude_urls=["http://doha"]) == []
+
+
+def test_stale_rows_are_ignored_and_deleted(index):
+    with sqlite3.connect(index.INDEX_PATH) as conn:
+        conn.execute("UPDATE summaries SET created_at = ?", (time.time() - index.INDEX_MAX_AGE_HOURS * 3600 - 1,))
+    assert index.get_summary("http://doha", "en") is None
+
+    index.add_summaries([("http://new", "en", "Fresh summary.")])
+    with sqlite3.connect(index.INDEX_PATH) as conn:
+        assert conn.execute("SELECT url FROM summaries").fetchall() == [("http://new",)]
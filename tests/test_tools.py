@@ -0,0 +1,81 @@
+from tools import (
+    MAX_TOKENS_PER_CONTENT,
+    NOVELTY_THRESHOLD,
+    chunk_text,
+    content_terms,
+    estimate_tokens,
+    novelty_score,
+)
+
+# Two sources on the same topic: L2 restates L1's facts in different words,
+# L3 covers a different aspect.
+L1 = (
+    "The International Energy Agency's Global EV Outlook 2024 reports that electric car sales reached nearly "
+    "14 million in 2023, up 35% from the previous year, bringing the global electric fleet to about 40 million "
+    "vehicles. Electric cars made up around 18% of all cars sold. China accounted for roughly 60% of global "
+    "electric car sales, Europe for close to 25%, and the United States for about 10%. BYD and Tesla were the "
+    "leading manufacturers, with BYD selling over 3 million plug-in vehicles. Falling battery costs and intense "
+    "price competition in China made many electric models cheaper than comparable combustion cars, and the "
+    "agency expects sales to rise to around 17 million in 2024 despite slowing growth in some markets."
+)
+L2 = (
+    "According to the IEA's 2024 Global EV Outlook, roughly 14 million electric cars were sold worldwide during "
+    "2023, a 35 percent increase year on year, pushing the total number of electric cars on the road to around "
+    "40 million. This represents an 18 percent share of the overall car market. Chinese sales made up about 60 "
+    "percent of the global total, with Europe contributing roughly a quarter and the US around a tenth. Among "
+    "automakers, BYD and Tesla led, and BYD delivered more than 3 million plug-in models. Cheaper batteries and a "
+    "price war among Chinese brands meant electric cars were often less expensive than petrol equivalents, and "
+    "the IEA forecasts about 17 million sales in 2024 even as growth slows in certain regions."
+)
+L3 = (
+    "Charging infrastructure is expanding rapidly: public chargers worldwide grew by 40% in 2023 to more than "
+    "4 million points, with China hosting about 65% of them. The European Union's AFIR regulation mandates fast "
+    "chargers every 60 km along major highways by 2025, while the US NEVI program allocates $5 billion to build a "
+    "national network. Tesla opened its Supercharger network to other brands, and the NACS connector was adopted "
+    "by Ford, GM and Rivian as the North American standard."
+)
+
+
+def test_content_terms_drops_stopwords_and_folds_plurals():
+    terms = content_terms("The sales of the Tesla cars and the sale in 2023")
+    assert "the" not in terms and "and" not in terms
+    assert "sale" in terms and "sales" not in terms
+    assert terms["tesla"] > terms["sale"]  # names and numbers carry the facts
+    assert terms["2023"] == terms["tesla"]
+
+
+def test_paraphrase_scores_below_threshold():
+    assert novelty_score(content_terms(L2), set(content_terms(L1))) < NOVELTY_THRESHOLD
+
+
+def test_new_facts_score_above_threshold():
+    seen = set(content_terms(L1))
+    assert novelty_score(content_terms(L3), seen) > NOVELTY_THRESHOLD
+    # A loop mixing a repeat with a new source still counts as novel
+    assert novelty_score(content_terms(L2 + "\n" + L3), seen) > NOVELTY_THRESHOLD
+
+
+def test_novelty_score_edge_cases():
+    assert novelty_score({}, {"anything"}) == 0.0
+    assert novelty_score(content_terms(L1), set()) == 1.0
+    assert novelty_score(content_terms(L1), set(content_terms(L1))) == 0.0
+
+
+def test_chunk_text_short_text_is_one_chunk():
+    assert chunk_text("short text") == ["short text"]
+
+
+def test_chunk_text_respects_budget_and_keeps_content():
+    text = "\n\n".join(f"Paragraph {i}. " + "word " * 400 for i in range(40))
+    chunks = chunk_text(text)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= MAX_TOKENS_PER_CONTENT for chunk in chunks)
+    assert all(chunk.startswith("Paragraph") for chunk in chunks)  # cut at paragraph breaks
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_chunk_text_without_separators_hard_cuts():
+    text = "x" * (MAX_TOKENS_PER_CONTENT * 4 * 2 + 10)
+    chunks = chunk_text(text)
+    assert "".join(chunks) == text
+    assert all(estimate_tokens(chunk) <= MAX_TOKENS_PER_CONTENT for chunk in chunks)